@@ -1,7 +1,61 @@
 import random
 import os
+import sys
+from collections import deque
+
+# Cell contents are stored as bit flags
+PIT, WUMPUS, GOLD, BREEZE, STENCH = 1, 2, 4, 8, 16
+CELL_CHARS = ((PIT, 'P'), (WUMPUS, 'W'), (GOLD, 'G'), (BREEZE, 'B'), (STENCH, 'S'))
+
+SIZE = 4
+
+# The whole grid can be read as one int, one byte per cell (little-endian),
+# so a neighbor is a shift by 8 bits (column) or 8 * SIZE bits (row)
+def board_mask(byte, cols=range(SIZE)):
+    return int.from_bytes(bytes(byte if i % SIZE in cols else 0 for i in range(SIZE * SIZE)), 'little')
+
+ONES = board_mask(1)
+ALL_CELLS = board_mask(0xFF)
+NOT_FIRST_COL = board_mask(0xFF, range(1, SIZE))
+NOT_LAST_COL = board_mask(0xFF, range(SIZE - 1))
+KEEP_OBJECTS = ~(ONES * (BREEZE | STENCH))
+
+def spread(plane):
+    # Moves every flagged cell onto its four neighbors at once
+    return (((plane << 8) & NOT_FIRST_COL) | ((plane >> 8) & NOT_LAST_COL)
+            | ((plane << 8 * SIZE) & ALL_CELLS) | (plane >> 8 * SIZE))
+
+def cell_to_str(cell):
+    return ''.join(char for bit, char in CELL_CHARS if cell & bit)
+
+# Static display pieces
+TITLE = "================ WUMPUS WORLD ================"
+HLINE = " +------+------+------+------+"
+CONTROLS = (
+    "\n[CONTROLS]\n"
+    " f : Forward | l : Left | r : Right\n"
+    " s : Shoot   | g : Grab | q : Quit\n"
+    "=============================================="
+)
+DIR_CHARS = (">", "^", "<", "v")
+
+def render_cell(content, agent_dir):
+    # agent_dir is -1 when the agent is not drawn on this cell
+    if agent_dir >= 0:
+        content = "A" + DIR_CHARS[agent_dir] + content
+    return f"{content:^6}|"
+
+# Rendered cell (with its right border) for every bitmask and agent overlay
+RENDER = {(mask, d): render_cell(cell_to_str(mask) or ' ', d) for mask in range(32) for d in range(-1, 4)}
+RENDER_FOG = {d: render_cell(" ? ", d) for d in range(-1, 4)}
 
 class Agent:
+    # (dr, dc) for East, North, West, South
+    _DELTAS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+    _DIR_NAMES = ("East", "North", "West", "South")
+    _LEFT = (1, 2, 3, 0)
+    _RIGHT = (3, 0, 1, 2)
+
     def __init__(self):
         self.row = 0
         self.col = 0
@@ -10,216 +64,372 @@ class Agent:
         self.has_gold = False
         self.has_arrow = True
         self.is_alive = True
-        self.messages = []
+        # (template, args) pairs, only formatted when displayed
+        self.messages = deque(maxlen=16)
 
     def turn_left(self):
-        self.direction = (self.direction + 1) % 4
-        self.messages.append(f"Turned Left. Facing: {self.get_direction_name()}")
+        self.direction = Agent._LEFT[self.direction]
+        self.messages.append(("Turned Left. Facing: {}", (Agent._DIR_NAMES[self.direction],)))
 
     def turn_right(self):
-        self.direction = (self.direction - 1) % 4
-        self.messages.append(f"Turned Right. Facing: {self.get_direction_name()}")
+        self.direction = Agent._RIGHT[self.direction]
+        self.messages.append(("Turned Right. Facing: {}", (Agent._DIR_NAMES[self.direction],)))
 
     def get_direction_name(self):
-        dirs = ["East", "North", "West", "South"]
-        return dirs[self.direction]
+        return Agent._DIR_NAMES[self.direction]
 
     def get_forward_pos(self):
-        dr, dc = 0, 0
-        if self.direction == 0: dc = 1
-        elif self.direction == 1: dr = 1
-        elif self.direction == 2: dc = -1
-        elif self.direction == 3: dr = -1
+        dr, dc = Agent._DELTAS[self.direction]
         return self.row + dr, self.col + dc
 
     def get_delta_direction(self):
-        if self.direction == 0: return 0, 1
-        elif self.direction == 1: return 1, 0
-        elif self.direction == 2: return 0, -1
-        elif self.direction == 3: return -1, 0
+        return Agent._DELTAS[self.direction]
+
+
+def build_rays():
+    # Cells an arrow flies through, keyed by (row, col, direction), up to the wall
+    rays = {}
+    for r in range(SIZE):
+        for c in range(SIZE):
+            for d, (dr, dc) in enumerate(Agent._DELTAS):
+                ray = []
+                cr, cc = r + dr, c + dc
+                while 0 <= cr < SIZE and 0 <= cc < SIZE:
+                    ray.append(cr * SIZE + cc)
+                    cr += dr
+                    cc += dc
+                rays[(r, c, d)] = tuple(ray)
+    return rays
+
+RAYS = build_rays()
+
+def sensors_kernel(grid, wumpus_idx):
+    # Same result as WumpusWorld.update_sensors, written as plain loops for Numba; wumpus_idx is -1 once killed
+    keep = 0xFF & ~(BREEZE | STENCH)
+    for i in range(SIZE * SIZE):
+        grid[i] = grid[i] & keep
+    for i in range(SIZE * SIZE):
+        if grid[i] & PIT or i == wumpus_idx:
+            sensor = BREEZE if grid[i] & PIT else 0
+            if i == wumpus_idx:
+                sensor |= STENCH
+            r, c = i // SIZE, i % SIZE
+            if r > 0: grid[i - SIZE] |= sensor
+            if r < SIZE - 1: grid[i + SIZE] |= sensor
+            if c > 0: grid[i - 1] |= sensor
+            if c < SIZE - 1: grid[i + 1] |= sensor
+
+update_sensors_nb = None
+
+def load_sensors_kernel():
+    # Imports Numba and jits sensors_kernel on first use, None when Numba is missing
+    global update_sensors_nb
+    if update_sensors_nb is None:
+        try:
+            from numba import njit
+        except ImportError:
+            return None
+        update_sensors_nb = njit(cache=True)(sensors_kernel)
+    return update_sensors_nb
 
 
 class WumpusWorld:
-    def __init__(self):
-        self.size = 4
-        self.grid = [['' for _ in range(self.size)] for _ in range(self.size)]
+    def __init__(self, fog=True, jit=False):
+        self.size = SIZE
+        # With fog of war, unvisited cells stay hidden until the game ends
+        self.fog = fog
+        # Opt-in Numba kernel for update_sensors, only worth its compile time over many resets
+        self.sensors_kernel = load_sensors_kernel() if jit else None
+        # Flat board, cell (r, c) lives at index r * size + c
+        self.grid = bytearray(self.size * self.size)
         self.agent = Agent()
-        # Track visited cells
-        self.visited = set()
-        self.visited.add((0, 0)) # Start point is always visible
+        # Track visited cells, bit r * size + c is set once (r, c) is visited
+        self.visited = 1 # Start point is always visible
+        # Grid index of the Wumpus, None once killed
+        self.wumpus_idx = None
 
         self.place_objects()
         self.update_sensors()
 
+    @classmethod
+    def create_batch(cls, n, seed=None):
+        """
+        Creates n independent boards stored as NumPy arrays, for running many episodes at once.
+        See WumpusBatch.
+        """
+        return WumpusBatch(n, seed)
+
     def place_objects(self):
         available_cells = [(r, c) for r in range(self.size) for c in range(self.size) if (r, c) != (0, 0)]
 
+        # One draw of distinct cells: Gold, Wumpus, then 3 Pits
+        picks = random.sample(available_cells, 5)
+
         # Gold
-        gold_pos = random.choice(available_cells)
-        self.grid[gold_pos[0]][gold_pos[1]] += 'G'
-        available_cells.remove(gold_pos)
+        gold_pos = picks[0]
+        self.grid[gold_pos[0] * self.size + gold_pos[1]] |= GOLD
 
         # Wumpus
-        wumpus_pos = random.choice(available_cells)
-        self.grid[wumpus_pos[0]][wumpus_pos[1]] += 'W'
-        if wumpus_pos in available_cells: available_cells.remove(wumpus_pos)
+        wumpus_pos = picks[1]
+        self.wumpus_idx = wumpus_pos[0] * self.size + wumpus_pos[1]
+        self.grid[self.wumpus_idx] |= WUMPUS
 
         # Pits
-        for _ in range(3):
-            if available_cells:
-                pit_pos = random.choice(available_cells)
-                self.grid[pit_pos[0]][pit_pos[1]] += 'P'
-                available_cells.remove(pit_pos)
-
-    def is_valid(self, r, c):
-        return 0 <= r < self.size and 0 <= c < self.size
+        for pit_pos in picks[2:]:
+            self.grid[pit_pos[0] * self.size + pit_pos[1]] |= PIT
 
     def update_sensors(self):
-        # Clear sensors
-        for r in range(self.size):
-            for c in range(self.size):
-                self.grid[r][c] = self.grid[r][c].replace('S', '').replace('B', '')
+        if self.sensors_kernel is not None:
+            self.sensors_kernel(self.grid, -1 if self.wumpus_idx is None else self.wumpus_idx)
+            return
 
-        deltas = [(-1, 0), (1, 0), (0, 1), (0, -1)]
-        for r in range(self.size):
-            for c in range(self.size):
-                content = self.grid[r][c]
-                if 'W' in content:
-                    for dr, dc in deltas:
-                        nr, nc = r + dr, c + dc
-                        if self.is_valid(nr, nc) and 'S' not in self.grid[nr][nc]:
-                            self.grid[nr][nc] += 'S'
-                if 'P' in content:
-                    for dr, dc in deltas:
-                        nr, nc = r + dr, c + dc
-                        if self.is_valid(nr, nc) and 'B' not in self.grid[nr][nc]:
-                            self.grid[nr][nc] += 'B'
+        board = int.from_bytes(self.grid, 'little')
+        pits = board & ONES # PIT is bit 0
+
+        # Old sensors are dropped and new ones set in the same expression
+        board = (board & KEEP_OBJECTS) | spread(pits) * BREEZE
+        if self.wumpus_idx is not None:
+            board |= spread(1 << 8 * self.wumpus_idx) * STENCH
+        self.grid[:] = board.to_bytes(len(self.grid), 'little')
 
     def kill_wumpus(self):
-        for r in range(self.size):
-            for c in range(self.size):
-                if 'W' in self.grid[r][c]:
-                    self.grid[r][c] = self.grid[r][c].replace('W', '')
-                if 'S' in self.grid[r][c]:
-                    self.grid[r][c] = self.grid[r][c].replace('S', '')
-        self.agent.messages.append("SCREAM!!! You killed the Wumpus!")
+        self.grid[self.wumpus_idx] &= ~WUMPUS
+        self.wumpus_idx = None
+        self.update_sensors() # Drops the Stench
+        self.agent.messages.append(("SCREAM!!! You killed the Wumpus!", ()))
 
     def step(self, action):
-        self.agent.messages = []
+        self.agent.messages.clear()
         if not self.agent.is_alive: return
 
         if action == 'f':
             nr, nc = self.agent.get_forward_pos()
-            if self.is_valid(nr, nc):
+            if 0 <= nr < self.size and 0 <= nc < self.size:
                 self.agent.row, self.agent.col = nr, nc
-                self.visited.add((nr, nc)) # Mark new cell as visited
-                self.agent.messages.append(f"Moved to ({nr}, {nc}).")
+                self.visited |= 1 << (nr * self.size + nc) # Mark new cell as visited
+                self.agent.messages.append(("Moved to ({}, {}).", (nr, nc)))
                 self.check_safety()
             else:
-                self.agent.messages.append("Bump! You hit a wall.")
+                self.agent.messages.append(("Bump! You hit a wall.", ()))
 
         elif action == 'l': self.agent.turn_left()
         elif action == 'r': self.agent.turn_right()
 
         elif action == 'g':
-            if 'G' in self.grid[self.agent.row][self.agent.col]:
+            idx = self.agent.row * self.size + self.agent.col
+            if self.grid[idx] & GOLD:
                 self.agent.has_gold = True
-                self.agent.messages.append("GLITTER! Found GOLD!")
-                self.grid[self.agent.row][self.agent.col] = self.grid[self.agent.row][self.agent.col].replace('G', '')
+                self.agent.messages.append(("GLITTER! Found GOLD!", ()))
+                self.grid[idx] &= ~GOLD
             else:
-                self.agent.messages.append("No gold here.")
+                self.agent.messages.append(("No gold here.", ()))
 
         elif action == 's':
             if self.agent.has_arrow:
                 self.agent.has_arrow = False
-                self.agent.messages.append("You shot an arrow!")
-                dr, dc = self.agent.get_delta_direction()
-                cr, cc = self.agent.row, self.agent.col
-                while True:
-                    cr += dr
-                    cc += dc
-                    if not self.is_valid(cr, cc):
-                        self.agent.messages.append("Arrow hit the wall.")
-                        break
-                    if 'W' in self.grid[cr][cc]:
+                self.agent.messages.append(("You shot an arrow!", ()))
+                for idx in RAYS[(self.agent.row, self.agent.col, self.agent.direction)]:
+                    if self.grid[idx] & WUMPUS:
                         self.kill_wumpus()
                         break
+                else:
+                    self.agent.messages.append(("Arrow hit the wall.", ()))
             else:
-                self.agent.messages.append("You have no arrows left!")
+                self.agent.messages.append(("You have no arrows left!", ()))
 
     def check_safety(self):
-        current_cell = self.grid[self.agent.row][self.agent.col]
-        if 'P' in current_cell:
-            self.agent.messages.append("YYYAAAHH! Fell into a Pit! (DEAD)")
+        current_cell = self.grid[self.agent.row * self.size + self.agent.col]
+        if current_cell & PIT:
+            self.agent.messages.append(("YYYAAAHH! Fell into a Pit! (DEAD)", ()))
             self.agent.is_alive = False
-        elif 'W' in current_cell:
-            self.agent.messages.append("ROAR! Eaten by Wumpus! (DEAD)")
+        elif current_cell & WUMPUS:
+            self.agent.messages.append(("ROAR! Eaten by Wumpus! (DEAD)", ()))
             self.agent.is_alive = False
 
     def clear_screen(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        # ANSI cursor home + clear, no subprocess per frame
+        sys.stdout.write("\x1b[H\x1b[2J")
 
     def display(self, reveal_all=False):
         """
         Displays the grid.
-        If reveal_all is False (during game), hides unvisited cells with '?'.
+        If reveal_all is False (during game), hides unvisited cells with '?' when fog is on.
         If reveal_all is True (game over), shows everything.
         """
         self.clear_screen()
-        print("================ WUMPUS WORLD ================")
-
-        h_line = " +------+------+------+------+"
-        print(h_line)
+        lines = [TITLE, HLINE]
+        # Always show Agent on top if it's their position (unless dead/game over revealed)
+        agent_idx = self.agent.row * self.size + self.agent.col if self.agent.is_alive else -1
         for r in range(self.size - 1, -1, -1):
             row_str = " |"
             for c in range(self.size):
-                cell_content = self.grid[r][c]
+                idx = r * self.size + c
+                agent_dir = self.agent.direction if idx == agent_idx else -1
 
                 # FOG OF WAR LOGIC
-                if not reveal_all and (r, c) not in self.visited:
+                if self.fog and not reveal_all and not (self.visited >> idx) & 1:
                     # If not visited and game is running, show '?'
-                    print_content = " ? "
+                    row_str += RENDER_FOG[agent_dir]
                 else:
                     # If visited OR revealing map
-                    print_content = cell_content
                     # Optional: Even if visited, maybe don't show 'W' if agent is alive?
                     # But for simplicity, we show what's there if visited.
-                    if print_content == '': print_content = ' '
-
-                # Always show Agent on top if it's their position (unless dead/game over revealed)
-                if r == self.agent.row and c == self.agent.col and self.agent.is_alive:
-                    dirs_char = [">", "^", "<", "v"]
-                    print_content = "A" + dirs_char[self.agent.direction] + print_content.replace('A', '')
-
-                row_str += f"{print_content:^6}|"
+                    row_str += RENDER[(self.grid[idx], agent_dir)]
 
-            print(row_str)
-            print(h_line)
+            lines.append(row_str)
+            lines.append(HLINE)
 
-        print("\n[STATUS REPORT]")
-        print(f" Location: ({self.agent.row}, {self.agent.col})")
-        print(f" Arrows: {1 if self.agent.has_arrow else 0}")
+        lines.append("\n[STATUS REPORT]")
+        lines.append(f" Location: ({self.agent.row}, {self.agent.col})")
+        lines.append(f" Arrows: {1 if self.agent.has_arrow else 0}")
 
         # Percepts are ALWAYS shown for current cell
-        current_content = self.grid[self.agent.row][self.agent.col]
+        current_content = self.grid[self.agent.row * self.size + self.agent.col]
         senses = []
-        if 'B' in current_content: senses.append("BREEZE")
-        if 'S' in current_content: senses.append("STENCH")
-        if 'G' in current_content: senses.append("GLITTER")
+        if current_content & BREEZE: senses.append("BREEZE")
+        if current_content & STENCH: senses.append("STENCH")
+        if current_content & GOLD: senses.append("GLITTER")
 
-        if senses: print(f" SENSES: {', '.join(senses)}")
-        else: print(" SENSES: None")
+        if senses: lines.append(f" SENSES: {', '.join(senses)}")
+        else: lines.append(" SENSES: None")
 
-        for msg in self.agent.messages:
-            print(f" > {msg}")
+        for template, args in self.agent.messages:
+            lines.append(" > " + template.format(*args))
 
-        print("\n[CONTROLS]")
-        print(" f : Forward | l : Left | r : Right")
-        print(" s : Shoot   | g : Grab | q : Quit")
-        print("==============================================")
+        lines.append(CONTROLS)
+        sys.stdout.write("\n".join(lines) + "\n")
+
+np = None
+
+def load_numpy():
+    # NumPy is only needed for batch simulation, so it is imported on first use
+    global np
+    if np is None:
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("WumpusBatch requires NumPy") from None
+    return np
+
+def near(flags):
+    # True where any of the four neighbors is flagged, for a (n, SIZE, SIZE) bool array
+    out = np.zeros_like(flags)
+    out[:, 1:] |= flags[:, :-1]
+    out[:, :-1] |= flags[:, 1:]
+    out[:, :, 1:] |= flags[:, :, :-1]
+    out[:, :, :-1] |= flags[:, :, 1:]
+    return out
+
+def update_sensors_batch(grids):
+    # Vectorized update_sensors over a (n, SIZE, SIZE) uint8 array, in place
+    breeze = near((grids & PIT) != 0)
+    stench = near((grids & WUMPUS) != 0)
+    grids &= np.uint8(0xFF & ~(BREEZE | STENCH))
+    grids |= breeze.astype(np.uint8) * BREEZE | stench.astype(np.uint8) * STENCH
+
+
+class WumpusBatch:
+    """
+    Many Wumpus worlds played in lockstep, without display or messages.
+    Boards are one (n, SIZE, SIZE) uint8 array and agent state is kept as
+    one array per field, indexed by board.
+    """
+    OBJECTS = (GOLD, WUMPUS, PIT, PIT, PIT)
+
+    def __init__(self, n, seed=None):
+        load_numpy()
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.grids = np.zeros((n, SIZE, SIZE), np.uint8)
+        self.row = np.zeros(n, np.intp)
+        self.col = np.zeros(n, np.intp)
+        self.direction = np.zeros(n, np.intp)
+        self.has_gold = np.zeros(n, bool)
+        self.has_arrow = np.ones(n, bool)
+        self.is_alive = np.ones(n, bool)
+
+        # Agent tables from Agent, as arrays for fancy indexing
+        self.deltas = np.array(Agent._DELTAS)
+        self.left = np.array(Agent._LEFT)
+        self.right = np.array(Agent._RIGHT)
+        # ray_masks[r, c, d] flags the cells an arrow shot from (r, c) facing d flies through
+        self.ray_masks = np.zeros((SIZE, SIZE, 4, SIZE * SIZE), bool)
+        for (r, c, d), ray in RAYS.items():
+            self.ray_masks[r, c, d, list(ray)] = True
+
+        self.reset()
+
+    @property
+    def won(self):
+        # Holding the gold back at the start cell
+        return self.has_gold & (self.row == 0) & (self.col == 0)
+
+    @property
+    def done(self):
+        return ~self.is_alive | self.won
+
+    def reset(self, mask=None):
+        """
+        Starts a new episode on the boards selected by the boolean mask, or on every board.
+        The other boards keep their state.
+        """
+        boards = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+        self.grids[boards] = 0
+        self.row[boards] = 0
+        self.col[boards] = 0
+        self.direction[boards] = 0
+        self.has_gold[boards] = False
+        self.has_arrow[boards] = True
+        self.is_alive[boards] = True
+
+        # Sorting random keys gives each board its own distinct cells, (0, 0) is keyed last so never picked
+        keys = self.rng.random((len(boards), SIZE * SIZE))
+        keys[:, 0] = 2
+        picks = np.argsort(keys, axis=1)[:, :len(self.OBJECTS)]
+        flat = self.grids.reshape(self.n, SIZE * SIZE)
+        flat[boards[:, None], picks] = self.OBJECTS
+        grids = self.grids[boards]
+        update_sensors_batch(grids)
+        self.grids[boards] = grids
+
+    def step(self, actions):
+        """
+        Applies one action per board, using the same letters as WumpusWorld.step.
+        Boards that are done (dead or won) are left untouched until reset.
+        """
+        actions = np.asarray(actions)
+        active = ~self.done
+        boards = np.arange(self.n)
+        flat = self.grids.reshape(self.n, SIZE * SIZE)
+
+        turn = active & (actions == 'l')
+        self.direction[turn] = self.left[self.direction[turn]]
+        turn = active & (actions == 'r')
+        self.direction[turn] = self.right[self.direction[turn]]
+
+        nr = self.row + self.deltas[self.direction, 0]
+        nc = self.col + self.deltas[self.direction, 1]
+        moved = active & (actions == 'f') & (0 <= nr) & (nr < SIZE) & (0 <= nc) & (nc < SIZE)
+        self.row[moved] = nr[moved]
+        self.col[moved] = nc[moved]
+        cell = self.grids[boards, self.row, self.col]
+        self.is_alive &= ~(moved & ((cell & (PIT | WUMPUS)) != 0))
+
+        grab = active & (actions == 'g') & ((cell & GOLD) != 0)
+        self.has_gold |= grab
+        self.grids[boards[grab], self.row[grab], self.col[grab]] &= np.uint8(0xFF & ~GOLD)
+
+        shoot = active & (actions == 's') & self.has_arrow
+        self.has_arrow &= ~shoot
+        on_ray = self.ray_masks[self.row, self.col, self.direction]
+        hit = shoot & (((flat & WUMPUS) != 0) & on_ray).any(axis=1)
+        if hit.any():
+            flat[hit] &= np.uint8(0xFF & ~WUMPUS)
+            update_sensors_batch(self.grids)
 
 # --- Main Loop ---
 if __name__ == "__main__":
+    if os.name == 'nt': os.system('') # Enables ANSI escape codes in the Windows console
     game = WumpusWorld()
     game.display()
 